@@ -24,13 +24,22 @@ present in the same repository.  See the README in this
 project's root for deployment instructions.
 """
 
-import re
+from collections import namedtuple
 from pathlib import Path
+from types import MappingProxyType
+import sys
 import time
 import random
 import streamlit as st
 
 
+# Header illustration shipped alongside this script.  Resolved once here so
+# the render path does not re‑stat the filesystem on every rerun; ``None``
+# when the image is missing (e.g. a stripped-down deployment).
+_HEADER_PATH = Path(__file__).parent / "static" / "header.png"
+_HEADER_PATH = str(_HEADER_PATH) if _HEADER_PATH.exists() else None
+
+
 # -----------------------------------------------------------------------------
 # Data definitions
 # -----------------------------------------------------------------------------
@@ -88,6 +97,20 @@ COVERAGE_DEFINITIONS = {
 }
 
 
+# Standard coverage limits shared by every plan.  A plan's actual limits are
+# derived from its coverage list, applying any per-plan overrides, so values
+# are stated once here instead of repeated per plan.
+_DEFAULT_LIMITS = {
+    "ctpl": 100_000,
+    "own damage": 400_000,
+    "acts of god": 300_000,
+    "personal accident": 200_000,
+    "malicious mischief": 300_000,
+    "roadside assistance": 0,  # Service benefit rather than monetary limit
+    "loss of use": 2_500,  # daily reimbursement limit
+}
+
+
 # Fictional policy plans.  Each entry contains a friendly name, premium,
 # description and a list of included coverage types.  The premiums and
 # coverage limits are purely illustrative and **not** actual quotations.
@@ -99,9 +122,6 @@ POLICY_PLANS = {
             " offers affordable peace of mind for budget‑conscious drivers."
         ),
         "coverage": ["ctpl"],
-        "limits": {
-            "ctpl": 100_000,
-        },
     },
     "Standard": {
         "premium": 7500,
@@ -111,11 +131,6 @@ POLICY_PLANS = {
             " paying for all the bells and whistles."
         ),
         "coverage": ["ctpl", "own damage", "acts of god"],
-        "limits": {
-            "ctpl": 100_000,
-            "own damage": 400_000,
-            "acts of god": 300_000,
-        },
     },
     "Premium": {
         "premium": 14000,
@@ -133,52 +148,294 @@ POLICY_PLANS = {
             "roadside assistance",
             "loss of use",
         ],
-        "limits": {
-            "ctpl": 100_000,
+        "limit_overrides": {
             "own damage": 800_000,
             "acts of god": 600_000,
-            "personal accident": 200_000,
-            "malicious mischief": 300_000,
-            "roadside assistance": 0,  # Service benefit rather than monetary limit
-            "loss of use": 2_500,  # daily reimbursement limit
         },
     },
 }
 
 
+def _freeze_static_data() -> None:
+    """Derive each plan's limits and make the data tables read-only.
+
+    A plan's ``limits`` mapping is built from its coverage list using
+    ``_DEFAULT_LIMITS`` plus any ``limit_overrides`` it declares.  Coverage
+    lists become tuples, the nested limit dicts and the top-level tables
+    become ``MappingProxyType`` views, and the key strings are interned so
+    repeated dict lookups can short-circuit on pointer identity.  Freezing
+    guards the shared tables against accidental mutation from the request
+    path and lets every rerun reuse them without defensive copies.
+    """
+    global COVERAGE_DEFINITIONS, POLICY_PLANS
+    COVERAGE_DEFINITIONS = MappingProxyType(
+        {sys.intern(key): text for key, text in COVERAGE_DEFINITIONS.items()}
+    )
+    plans = {}
+    for name, plan in POLICY_PLANS.items():
+        overrides = plan.pop("limit_overrides", {})
+        plan["coverage"] = tuple(sys.intern(c) for c in plan["coverage"])
+        plan["limits"] = MappingProxyType(
+            {
+                sys.intern(c): overrides.get(c, _DEFAULT_LIMITS[c])
+                for c in plan["coverage"]
+            }
+        )
+        plans[sys.intern(name)] = MappingProxyType(plan)
+    POLICY_PLANS = MappingProxyType(plans)
+
+
+_freeze_static_data()
+
+
+# -----------------------------------------------------------------------------
+# Keyword matching
+# -----------------------------------------------------------------------------
+#
+# Matching is a single pass over the question against a character trie built
+# from every known keyword, so lookup cost stays flat as coverage types,
+# plans or intent words are added.  Should the vocabulary ever grow to many
+# thousands of patterns, a dedicated multi-pattern engine (pyahocorasick,
+# hyperscan) would be the drop-in next step; at the current scale the pure
+# Python trie wins by avoiding a binary dependency that Streamlit Cloud
+# would have to build.
+
+# Intent keywords that are not tied to a specific coverage type or plan.  Each
+# word maps to a coarse intent bucket handled in ``answer_question``.
+_INTENT_WORDS = {
+    "price": "price",
+    "prices": "price",
+    "cost": "price",
+    "costs": "price",
+    "premium": "price",
+    "premiums": "price",
+    "rate": "price",
+    "rates": "price",
+    "coverage": "coverage",
+    "covered": "coverage",
+    "covers": "coverage",
+    "benefit": "coverage",
+    "benefits": "coverage",
+}
+
+# Alternate phrasings accepted for the coverage keys.  The canonical key is
+# always matched; these add the common singular forms and synonyms customers
+# actually type.
+_COVERAGE_VARIANTS = {
+    "acts of god": ("act of god", "acts of nature", "act of nature"),
+    "personal accident": ("personal accidents",),
+    "malicious mischief": ("acts of malicious mischief",),
+}
+
+
+def _build_keyword_trie() -> dict:
+    """Build a FlashText‑style character trie over every known keyword.
+
+    The trie maps each coverage key, plan name and intent word to a small
+    ``(kind, value)`` tag such as ``("cov", "ctpl")`` or ``("plan", "Basic")``.
+    Building it once at import time lets ``answer_question`` find every
+    keyword in a question with a single linear scan instead of running a
+    separate search per keyword.  When a word carries more than one meaning
+    (e.g. "premium" is both a plan name and a pricing word) the first tag
+    inserted wins, so insertion order below mirrors the old dispatch order:
+    coverage definitions, then plans, then intents.
+    """
+    trie: dict = {}
+
+    def add(phrase: str, tag: tuple) -> None:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, tag)
+
+    for cov_key in COVERAGE_DEFINITIONS:
+        add(cov_key, ("cov", cov_key))
+        for variant in _COVERAGE_VARIANTS.get(cov_key, ()):
+            add(variant, ("cov", cov_key))
+    for plan_name in POLICY_PLANS:
+        add(plan_name.lower(), ("plan", plan_name))
+    for word, intent in _INTENT_WORDS.items():
+        add(word, ("intent", intent))
+    return trie
+
+
+def _scan_keywords(q: str, trie: dict, _isalnum=str.isalnum) -> list:
+    """Return the tags of all keywords found in ``q`` in match order.
+
+    Performs one left‑to‑right pass over the lowercased question.  A keyword
+    only counts when it starts and ends on a word boundary, so "premium" does
+    not fire inside "premiums" but "ctpl?" still matches "ctpl".  Longer
+    matches win at any given start position (e.g. "acts of god" rather than a
+    shorter prefix).  ``_isalnum`` is bound as a default argument so the
+    per‑character boundary checks resolve through a local instead of a
+    method lookup.
+    """
+    # Cheap prefilter: the trie root is keyed by the leading characters of
+    # every keyword, so a question containing none of them (the common
+    # fallback case) cannot match and skips the scan loop entirely.
+    if trie.keys().isdisjoint(q):
+        return []
+    hits = []
+    append = hits.append
+    n = len(q)
+    for i in range(n):
+        # Keywords must start at a word boundary.
+        if i and _isalnum(q[i - 1]):
+            continue
+        node = trie
+        match = None
+        j = i
+        while j < n and q[j] in node:
+            node = node[q[j]]
+            j += 1
+            if None in node and (j == n or not _isalnum(q[j])):
+                match = node[None]
+        if match is not None:
+            append(match)
+    return hits
+
+
 # -----------------------------------------------------------------------------
 # Helper functions
 # -----------------------------------------------------------------------------
 
+# Every amount appearing in the static plan data, pre-formatted.  The
+# fallback branch below only runs for amounts outside the known tables.
+_FMT_CACHE = {
+    amount: f"PHP {amount:,.0f}"
+    for plan in POLICY_PLANS.values()
+    for amount in list(plan["limits"].values()) + [plan["premium"]]
+}
+
+
 def format_currency(amount: int) -> str:
     """Return a string with the amount formatted as Philippine pesos."""
-    return f"PHP {amount:,.0f}"
+    cached = _FMT_CACHE.get(amount)
+    return cached if cached is not None else f"PHP {amount:,.0f}"
 
 
-def plan_info(plan_name: str) -> str:
+def _format_limit(cov: str, limit: int) -> str:
+    """Format a single coverage limit entry for display."""
+    if cov == "roadside assistance":
+        return "Roadside assistance: service included"
+    if cov == "loss of use":
+        return f"Loss of use: reimbursed up to {format_currency(limit)} per day"
+    name = "CTPL" if cov == "ctpl" else cov.title()
+    return f"{name}: {format_currency(limit)} limit"
+
+
+def _materialize_plan_displays() -> dict:
+    """Pre-format the display strings derived from each plan's static data.
+
+    Returns a mapping of plan name to the joined coverage list, formatted
+    limits and formatted premium, so the renderers below are plain
+    f-strings over pre-baked fields.  Kept separate from POLICY_PLANS,
+    which is frozen read-only.
+    """
+    displays = {}
+    for name, plan in POLICY_PLANS.items():
+        displays[name] = {
+            "coverage": ", ".join(
+                "CTPL" if c == "ctpl" else c.title() for c in plan["coverage"]
+            ),
+            "limits": "; ".join(
+                _format_limit(cov, limit) for cov, limit in plan["limits"].items()
+            ),
+            "premium": format_currency(plan["premium"]),
+        }
+    return displays
+
+
+def _render_plan_info(plan_name: str, display: dict) -> str:
     """Construct a detailed description of a given policy plan."""
     plan = POLICY_PLANS[plan_name]
-    lines = [f"**{plan_name} Plan**"]
-    lines.append(plan["description"])
-    lines.append("")
-    # List included coverage
-    coverage_list = [c.title() if c != "ctpl" else "CTPL" for c in plan["coverage"]]
-    lines.append("Included coverage: " + ", ".join(coverage_list) + ".")
-    # Premium
-    lines.append(f"Annual premium: {format_currency(plan['premium'])}.")
-    # Coverage limits
-    limit_lines = []
-    for cov, limit in plan["limits"].items():
-        if cov == "roadside assistance":
-            limit_lines.append("Roadside assistance: service included")
-        elif cov == "loss of use":
-            limit_lines.append(
-                f"Loss of use: reimbursed up to {format_currency(limit)} per day"
-            )
-        else:
-            limit_lines.append(f"{cov.title() if cov != 'ctpl' else 'CTPL'}: {format_currency(limit)} limit")
-    lines.append("Coverage limits: " + "; ".join(limit_lines) + ".")
-    return "\n".join(lines)
+    return (
+        f"**{plan_name} Plan**\n"
+        f"{plan['description']}\n\n"
+        f"Included coverage: {display['coverage']}.\n"
+        f"Annual premium: {display['premium']}.\n"
+        f"Coverage limits: {display['limits']}."
+    )
+
+
+def _render_price_reply(displays: dict) -> str:
+    """Render the summary of annual premiums across all plans."""
+    plan_lines = "\n".join(
+        f"- **{name} Plan**: {displays[name]['premium']}" for name in POLICY_PLANS
+    )
+    return (
+        "Here are the annual premiums for our available plans:\n"
+        f"{plan_lines}\n"
+        "\nAsk about a specific plan to see what it covers."
+    )
+
+
+def _render_coverage_overview() -> str:
+    """Render the high level overview summarising each coverage definition."""
+    return "\n".join(
+        ["We offer several types of coverage.  Here's a quick overview:"]
+        + [
+            f"- {definition.partition('.')[0]}."
+            for definition in COVERAGE_DEFINITIONS.values()
+        ]
+        + [
+            "\nYou can ask about any of these coverage types for more information"
+            " or inquire about a specific plan."
+        ]
+    )
+
+
+# Bundle of all static lookup structures used by ``answer_question``.
+_Dispatch = namedtuple(
+    "_Dispatch", ["trie", "plan_info_cache", "price_reply", "coverage_overview"]
+)
+
+
+@st.cache_resource(show_spinner=False)
+def _dispatch() -> _Dispatch:
+    """Build the keyword trie and pre‑rendered replies once per process.
+
+    Streamlit re‑executes this script from the top on every interaction, so
+    anything built at module level would be rebuilt on each rerun.
+    ``st.cache_resource`` keeps a single instance of these tables alive for
+    the lifetime of the worker process.
+    """
+    displays = _materialize_plan_displays()
+    return _Dispatch(
+        trie=_build_keyword_trie(),
+        plan_info_cache={
+            name: _render_plan_info(name, displays[name]) for name in POLICY_PLANS
+        },
+        price_reply=_render_price_reply(displays),
+        coverage_overview=_render_coverage_overview(),
+    )
+
+
+def plan_info(plan_name: str) -> str:
+    """Return the pre‑rendered description of a given policy plan."""
+    return _dispatch().plan_info_cache[plan_name]
+
+
+_FALLBACK_REPLY = (
+    "I'm sorry, I don't have an answer to that yet.  You can ask me about"
+    " car insurance coverage, premiums or one of our plans (Basic, Standard"
+    " or Premium)."
+)
+
+# Dispatch table mapping each match tag to its reply handler.  Handlers take
+# the dispatch bundle and the matched payload (coverage key or plan name;
+# ``None`` for the intent buckets); the ``None`` tag is the fallback when no
+# keyword matched.  Lower rank wins when a question matches several tags,
+# mirroring the original check order.
+_HANDLERS = {
+    "cov": lambda d, key: COVERAGE_DEFINITIONS[key],
+    "plan": lambda d, name: d.plan_info_cache[name],
+    "price": lambda d, _: d.price_reply,
+    "coverage": lambda d, _: d.coverage_overview,
+    None: lambda d, _: _FALLBACK_REPLY,
+}
+
+_TAG_RANK = {"cov": 0, "plan": 1, "price": 2, "coverage": 3}
 
 
 def answer_question(question: str) -> str:
@@ -187,47 +444,30 @@ def answer_question(question: str) -> str:
     The logic here is intentionally simple and keyword‑driven.  It scans the
     question for known plan names, coverage types and keywords such as 'price'
     or 'premium' and returns appropriate information.  If nothing matches it
-    provides a friendly default response.
+    provides a friendly default response.  Answers are memoized on the
+    normalized question, so repeated questions cost a single dict lookup.
     """
-    q = question.lower()
-    # Check for definitions of coverage types
-    for cov_key, definition in COVERAGE_DEFINITIONS.items():
-        # Accept variations of the keyword (e.g. acts of god, act of god)
-        pattern = cov_key.replace(" ", "|")  # simple variation
-        if re.search(pattern, q):
-            return definition
-    # Check for plan names
-    for plan_name in POLICY_PLANS:
-        if plan_name.lower() in q:
-            return plan_info(plan_name)
-    # Check for price/cost queries
-    if any(word in q for word in ["price", "cost", "premium", "rates"]):
-        lines = ["Here are the annual premiums for our available plans:"]
-        for name, plan in POLICY_PLANS.items():
-            lines.append(f"- **{name} Plan**: {format_currency(plan['premium'])}")
-        lines.append("\nAsk about a specific plan to see what it covers.")
-        return "\n".join(lines)
-    # General coverage query
-    if any(word in q for word in ["coverage", "covered", "benefits"]):
-        # Provide a high level summary of all coverage definitions
-        lines = [
-            "We offer several types of coverage.  Here's a quick overview:",
-        ]
-        for cov_key, definition in COVERAGE_DEFINITIONS.items():
-            # Extract the first sentence before the first period as a summary
-            summary = definition.split(".")[0] + "."
-            lines.append(f"- {summary}")
-        lines.append(
-            "\nYou can ask about any of these coverage types for more information or"
-            " inquire about a specific plan."
-        )
-        return "\n".join(lines)
-    # Fallback
-    return (
-        "I'm sorry, I don't have an answer to that yet.  You can ask me about"
-        " car insurance coverage, premiums or one of our plans (Basic, Standard"
-        " or Premium)."
-    )
+    return _answer(question.lower().strip())
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _answer(q: str) -> str:
+    """Compute the reply for an already lowercased, stripped question."""
+    d = _dispatch()
+    # One linear pass over the question finds every known keyword; the
+    # highest-ranked hit picks its handler from the dispatch table.
+    best = None
+    for kind, value in _scan_keywords(q, d.trie):
+        if kind == "intent":
+            kind, value = value, None
+        rank = _TAG_RANK[kind]
+        if rank == 0:
+            # Coverage definitions win outright; no later hit can beat them.
+            return _HANDLERS[kind](d, value)
+        if best is None or rank < best[0]:
+            best = (rank, kind, value)
+    tag, payload = (best[1], best[2]) if best is not None else (None, None)
+    return _HANDLERS[tag](d, payload)
 
 
 # -----------------------------------------------------------------------------
@@ -243,13 +483,10 @@ def main() -> None:
         initial_sidebar_state="collapsed",
     )
 
-    # Header image
-    # Locate the header illustration relative to this script
-    header_path = Path(__file__).parent / "static" / "header.png"
-    if header_path.exists():
-        # Display the header image.  ``use_column_width`` is deprecated in recent Streamlit
-        # releases, so rely solely on the ``width`` argument to control the size.
-        st.image(str(header_path), width=350)
+    # Header image.  ``use_column_width`` is deprecated in recent Streamlit
+    # releases, so rely solely on the ``width`` argument to control the size.
+    if _HEADER_PATH:
+        st.image(_HEADER_PATH, width=350)
     st.title("Car Insurance Chatbot")
     st.write(
         "Ask me about car insurance coverage, example policy plans or premiums."